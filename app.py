@@ -15,16 +15,17 @@ Institution: Northeastern University
 """
 
 import gradio as gr
+import matplotlib
+import numpy as np
 import pandas as pd
 
 from data_processor import (
     load_data,
+    convert_to_categorical,
+    downcast_numeric,
     get_basic_info,
     preview_data,
-    numeric_summary,
-    categorical_summary,
-    missing_values_report,
-    correlation_matrix,
+    compute_all_stats,
 )
 
 from visualizations import (
@@ -37,15 +38,35 @@ from visualizations import (
 )
 
 from insights import generate_all_insights
-from utils import get_filter_options
+from utils import (
+    classify_columns,
+    parse_date_columns,
+    parse_date_bound,
+    categorical_mask,
+    dataframe_payload,
+    save_data_as_csv,
+    save_data_as_parquet,
+)
+
+# Charts are rendered off-screen on the server
+matplotlib.use("Agg")
 
 # Constants
 DEFAULT_PREVIEW_ROWS = 5
 DEFAULT_FILTER_DISPLAY_ROWS = 100
 MAX_SCATTER_POINTS = 5000
+MAX_TIME_SERIES_POINTS = 2000
 TOP_N_CATEGORIES = 20
+MAX_FILTER_CHOICES = 10_000
+MAX_SUMMARY_COLUMNS = 50
 CHART_DPI = 150
 
+# Category dtype conversion at upload
+CONVERT_CATEGORIES = True
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+CATEGORY_MAX_UNIQUE = 100_000
+CATEGORY_MAX_ROWS = 5_000_000
+
 
 def create_dashboard():
     """Constructs and returns the full multi-tab Business Intelligence Dashboard interface."""
@@ -56,7 +77,12 @@ def create_dashboard():
 
         # Application state
         df_state = gr.State(value=None)                # Full dataset
-        filtered_state = gr.State(value=None)          # Filtered dataset
+        filter_mask_state = gr.State(value=None)       # Row mask of the filtered dataset
+        cols_state = gr.State(value=None)              # Column classification
+        dates_state = gr.State(value=None)             # Parsed date columns
+        cat_uniques_state = gr.State(value={})         # Sorted unique values per column
+        preview_state = gr.State(value=None)           # Filter tab preview rows
+        stats_cache = gr.State(value={})               # Statistics per dataset
 
         file_input = gr.File(label="Upload CSV or Excel File")
 
@@ -69,20 +95,61 @@ def create_dashboard():
             basic_info_output = gr.JSON(label="Dataset Information")
             preview_output = gr.DataFrame(label="Data Preview")
 
+            def preview_upload(file):
+                """Shows the first rows of the file while the full dataset is loading."""
+                if file is None:
+                    return None
+
+                try:
+                    head = load_data(file, nrows=DEFAULT_PREVIEW_ROWS)
+                except ValueError:
+                    # handle_upload reports the error when it loads the full file
+                    return None
+                finally:
+                    if hasattr(file, "seek"):
+                        file.seek(0)
+
+                return dataframe_payload(head)
+
             def handle_upload(file):
-                """Loads the dataset and returns metadata and a preview."""
+                """Loads the dataset and returns metadata, column classification, and a preview."""
                 if file is None:
-                    return None, {}, None
+                    return None, None, None, {}, None, {}, None, {}, None
 
                 df = load_data(file)
+                cols = classify_columns(df)
+                dates = parse_date_columns(df, cols["date"])
+
+                # Store repeated string values as category codes
+                if CONVERT_CATEGORIES and len(df) <= CATEGORY_MAX_ROWS:
+                    df = convert_to_categorical(
+                        df,
+                        max_unique_ratio=CATEGORY_MAX_UNIQUE_RATIO,
+                        max_unique=CATEGORY_MAX_UNIQUE,
+                        exclude=cols["date"],
+                    )
+
+                # Keep numeric columns in the smallest dtype that holds their values
+                df = downcast_numeric(df)
+
+                filter_preview = dataframe_payload(df.head(DEFAULT_FILTER_DISPLAY_ROWS))
                 info = get_basic_info(df)
-                preview = preview_data(df, n=DEFAULT_PREVIEW_ROWS)
-                return df, info, preview
+                preview = dataframe_payload(preview_data(df, n=DEFAULT_PREVIEW_ROWS))
+                return df, cols, dates, {}, filter_preview, {}, None, info, preview
 
-            file_input.change(
+            # Dropdown setup in the other tabs is chained onto this event so it
+            # runs after the cached column classification has been stored
+            upload_event = file_input.change(
+                fn=preview_upload,
+                inputs=file_input,
+                outputs=preview_output,
+            ).then(
                 fn=handle_upload,
                 inputs=file_input,
-                outputs=[df_state, basic_info_output, preview_output],
+                outputs=[
+                    df_state, cols_state, dates_state, cat_uniques_state, preview_state,
+                    stats_cache, filter_mask_state, basic_info_output, preview_output,
+                ],
             )
 
         # ===============================================================
@@ -98,23 +165,26 @@ def create_dashboard():
             missing_output = gr.JSON(label="Missing Values")
             corr_output = gr.DataFrame(label="Correlation Matrix")
 
-            def generate_statistics(df):
-                """Computes summary statistics for the dataset."""
+            def generate_statistics(df, cache):
+                """Computes summary statistics for the dataset, reusing cached results."""
                 if df is None:
-                    return None, None, None, None
+                    return None, None, None, None, cache
 
-                num = numeric_summary(df)
-                num = num.reset_index().rename(columns={"index": "Metric"})
-                cat = categorical_summary(df)
-                missing = missing_values_report(df)
-                corr = correlation_matrix(df)
+                # df_state only changes identity when a new file is uploaded;
+                # the shape guards against a recycled id after garbage collection
+                fingerprint = (id(df), df.shape)
+                if fingerprint not in cache:
+                    cache[fingerprint] = compute_all_stats(df, max_columns=MAX_SUMMARY_COLUMNS)
 
-                return num, cat, missing, corr
+                return (*cache[fingerprint], cache)
 
             stats_button.click(
                 fn=generate_statistics,
-                inputs=df_state,
-                outputs=[numeric_output, categorical_output, missing_output, corr_output],
+                inputs=[df_state, stats_cache],
+                outputs=[
+                    numeric_output, categorical_output, missing_output, corr_output,
+                    stats_cache,
+                ],
             )
 
         # ===============================================================
@@ -173,9 +243,9 @@ def create_dashboard():
                     row_count = gr.Markdown("Click 'Load Filter Options' to begin.")
                     filtered_data = gr.DataFrame(interactive=False)
 
-            def setup_filters(df):
-                """Initializes filter dropdown options based on dataset columns."""
-                if df is None:
+            def setup_filters(df, cols, preview):
+                """Initializes filter dropdowns and the preview table from cached upload results."""
+                if df is None or cols is None:
                     return (
                         gr.update(choices=[]),
                         gr.update(choices=[]),
@@ -184,111 +254,139 @@ def create_dashboard():
                         None,
                     )
 
-                numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-                cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
-                date_cols = [
-                    col for col in df.columns if "datetime" in str(df[col].dtype)
-                ]
-
-                # Remove date-like columns from categorical list
-                date_keywords = ["date", "time", "timestamp", "created", "updated"]
-                cat_cols = [
-                    col for col in cat_cols
-                    if not any(keyword in col.lower() for keyword in date_keywords)
-                ]
-
-                # Add string-based date-like columns to date candidates
-                for col in df.columns:
-                    if (
-                        col not in date_cols
-                        and any(keyword in col.lower() for keyword in date_keywords)
-                        and df[col].dtype == "object"
-                    ):
-                        date_cols.append(col)
-
                 return (
-                    gr.update(choices=cat_cols, value=None),
-                    gr.update(choices=numeric_cols, value=None),
-                    gr.update(choices=date_cols, value=None),
+                    gr.update(choices=cols["categorical"], value=None),
+                    gr.update(choices=cols["numeric"], value=None),
+                    gr.update(choices=cols["date"], value=None),
                     f"{len(df):,} rows available. Select filters and apply.",
-                    df.head(DEFAULT_FILTER_DISPLAY_ROWS),
+                    preview,
                 )
 
-            file_input.change(
+            upload_event.then(
                 fn=setup_filters,
-                inputs=df_state,
+                inputs=[df_state, cols_state, preview_state],
                 outputs=[cat_column, num_column, date_column, row_count, filtered_data],
             )
             filter_load_btn.click(
                 fn=setup_filters,
-                inputs=df_state,
+                inputs=[df_state, cols_state, preview_state],
                 outputs=[cat_column, num_column, date_column, row_count, filtered_data],
             )
 
-            def update_cat_values(df, col):
-                """Returns unique values for the selected categorical column."""
+            def update_cat_values(df, col, cache):
+                """Returns unique values for the selected categorical column, cached per column."""
                 if df is None or col is None:
-                    return gr.update(choices=[], value=[])
+                    return gr.update(choices=[], value=[], info=None), cache
+
+                if col not in cache:
+                    if isinstance(df[col].dtype, pd.CategoricalDtype):
+                        uniques = df[col].cat.categories.to_numpy()
+                    else:
+                        uniques = pd.unique(df[col].dropna().to_numpy())
+                    cache[col] = np.unique(np.asarray(uniques, dtype=str)).tolist()
+
+                # Keep the dropdown responsive on high-cardinality columns
+                choices = cache[col]
+                info = None
+                if len(choices) > MAX_FILTER_CHOICES:
+                    info = f"Showing the first {MAX_FILTER_CHOICES:,} of {len(choices):,} values."
+                    choices = choices[:MAX_FILTER_CHOICES]
 
-                values = sorted(df[col].dropna().astype(str).unique().tolist())
-                return gr.update(choices=values, value=[])
+                return gr.update(choices=choices, value=[], info=info), cache
 
             cat_column.change(
                 fn=update_cat_values,
-                inputs=[df_state, cat_column],
-                outputs=cat_values,
+                inputs=[df_state, cat_column, cat_uniques_state],
+                outputs=[cat_values, cat_uniques_state],
             )
 
-            def apply_filters(df, cat_col, cat_vals, num_col, n_min, n_max, date_col, d_start, d_end):
+            def apply_filters(
+                df, dates, preview, cat_col, cat_vals, num_col, n_min, n_max, date_col, d_start, d_end
+            ):
                 """Applies categorical, numeric, and date filters to the dataset."""
                 if df is None:
                     return "Upload a dataset to begin.", None, None
 
-                filtered = df.copy()
+                # Nothing selected: show the cached preview without building a mask
+                has_filter = (
+                    (cat_col and cat_vals)
+                    or (num_col and (n_min is not None or n_max is not None))
+                    or (date_col and (d_start or d_end))
+                )
+                if not has_filter:
+                    return (
+                        f"{len(df):,} of {len(df):,} rows match the applied filters.",
+                        preview,
+                        None,  # exports fall back to the full dataset
+                    )
+
+                # Combine all predicates into one mask and slice the dataset once.
+                # Comparisons are written into a reusable scratch buffer and
+                # ANDed into the mask in place to avoid per-filter allocations.
+                mask = np.ones(len(df), dtype=bool)
+                scratch = np.empty(len(df), dtype=bool)
 
                 # Categorical filtering
                 if cat_col and cat_vals:
-                    filtered = filtered[filtered[cat_col].astype(str).isin(cat_vals)]
+                    np.logical_and(mask, categorical_mask(df[cat_col], cat_vals), out=mask)
 
                 # Numeric filtering
-                if num_col in filtered.columns:
+                if num_col in df.columns:
+                    col_vals = df[num_col].to_numpy()
                     if n_min is not None:
-                        filtered = filtered[filtered[num_col] >= n_min]
+                        np.greater_equal(col_vals, n_min, out=scratch)
+                        np.logical_and(mask, scratch, out=mask)
                     if n_max is not None:
-                        filtered = filtered[filtered[num_col] <= n_max]
-
-                # Date filtering
-                if date_col in filtered.columns:
-                    if not pd.api.types.is_datetime64_any_dtype(filtered[date_col]):
-                        filtered[date_col] = pd.to_datetime(filtered[date_col], errors="coerce")
-
-                    if d_start:
-                        try:
-                            start_dt = pd.to_datetime(d_start)
-                            filtered = filtered[filtered[date_col] >= start_dt]
-                        except Exception:
-                            pass
-
-                    if d_end:
-                        try:
-                            end_dt = pd.to_datetime(d_end) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
-                            filtered = filtered[filtered[date_col] <= end_dt]
-                        except Exception:
-                            pass
+                        np.less_equal(col_vals, n_max, out=scratch)
+                        np.logical_and(mask, scratch, out=mask)
+
+                # Date filtering on the datetime64 values parsed at upload
+                if dates and date_col in dates:
+                    date_vals = dates[date_col]
+                elif date_col in df.columns:
+                    date_vals = parse_date_columns(df, [date_col]).get(date_col)
+                else:
+                    date_vals = None
+
+                # Columns that could not be parsed as dates are not filtered on
+                if date_vals is not None:
+
+                    start_dt = parse_date_bound(d_start) if d_start else None
+                    if start_dt is not None:
+                        np.greater_equal(date_vals, start_dt, out=scratch)
+                        np.logical_and(mask, scratch, out=mask)
+
+                    end_dt = parse_date_bound(d_end) if d_end else None
+                    if end_dt is not None:
+                        # Include the whole end day: values before the next midnight
+                        np.less(date_vals, end_dt + np.timedelta64(1, "D"), out=scratch)
+                        np.logical_and(mask, scratch, out=mask)
 
                 total = len(df)
-                count = len(filtered)
+                count = int(np.count_nonzero(mask))
+
+                # Only the displayed rows are gathered; exports apply the mask
+                # to the full dataset when requested
+                if count == total:
+                    return (
+                        f"{count:,} of {total:,} rows match the applied filters.",
+                        preview,
+                        None,
+                    )
 
+                shown = np.flatnonzero(mask)[:DEFAULT_FILTER_DISPLAY_ROWS]
                 return (
                     f"{count:,} of {total:,} rows match the applied filters.",
-                    filtered.head(DEFAULT_FILTER_DISPLAY_ROWS),
-                    filtered,
+                    dataframe_payload(df.iloc[shown]),
+                    mask,
                 )
 
             apply_btn.click(
                 fn=apply_filters,
                 inputs=[
                     df_state,
+                    dates_state,
+                    preview_state,
                     cat_column,
                     cat_values,
                     num_column,
@@ -298,11 +396,11 @@ def create_dashboard():
                     date_start,
                     date_end,
                 ],
-                outputs=[row_count, filtered_data, filtered_state],
+                outputs=[row_count, filtered_data, filter_mask_state],
             )
 
-            def clear_filters(df):
-                """Resets all filter controls to their default state."""
+            def clear_filters(df, preview):
+                """Resets all filter controls to their default state and restores the cached preview."""
                 if df is None:
                     return (
                         None, [], None, None, None, None, "", "",
@@ -313,19 +411,19 @@ def create_dashboard():
                 return (
                     None, [], None, None, None, None, "", "",
                     f"{len(df):,} rows available. Select filters and apply.",
-                    df.head(DEFAULT_FILTER_DISPLAY_ROWS),
-                    df,
+                    preview,
+                    None,  # exports fall back to the full dataset
                 )
 
             clear_btn.click(
                 fn=clear_filters,
-                inputs=df_state,
+                inputs=[df_state, preview_state],
                 outputs=[
                     cat_column, cat_values,
                     num_column, num_min, num_max,
                     date_column, date_start, date_end,
                     row_count, filtered_data,
-                    filtered_state,
+                    filter_mask_state,
                 ],
             )
 
@@ -335,21 +433,28 @@ def create_dashboard():
 
             with gr.Row():
                 export_csv_btn = gr.Button("Export Filtered Data as CSV")
-                csv_output = gr.File(label="Download CSV")
+                export_parquet_btn = gr.Button("Export Filtered Data as Parquet")
+                csv_output = gr.File(label="Download File")
 
-            def export_csv(filtered_df, full_df):
+            def export_csv(mask, full_df):
                 """Exports the filtered dataset or the full dataset as a CSV file."""
-                df = filtered_df if filtered_df is not None else full_df
-                if df is None:
-                    return None
-
-                filepath = "filtered_data.csv"
-                df.to_csv(filepath, index=False)
-                return filepath
+                df = full_df if mask is None else full_df.loc[mask]
+                return save_data_as_csv(df, "filtered_data.csv")
 
             export_csv_btn.click(
                 fn=export_csv,
-                inputs=[filtered_state, df_state],
+                inputs=[filter_mask_state, df_state],
+                outputs=csv_output,
+            )
+
+            def export_parquet(mask, full_df):
+                """Exports the filtered dataset or the full dataset as a Parquet file."""
+                df = full_df if mask is None else full_df.loc[mask]
+                return save_data_as_parquet(df, "filtered_data.parquet")
+
+            export_parquet_btn.click(
+                fn=export_parquet,
+                inputs=[filter_mask_state, df_state],
                 outputs=csv_output,
             )
 
@@ -418,47 +523,27 @@ def create_dashboard():
                         corr_btn = gr.Button("Correlation Heatmap", variant="secondary")
                     scatter_plot = gr.Plot()
 
-            def setup_viz_dropdowns(df):
-                """Populates visualization dropdowns based on data types."""
-                if df is None:
+            def setup_viz_dropdowns(cols):
+                """Populates visualization dropdowns from the cached column classification."""
+                if cols is None:
                     empty = gr.update(choices=[])
                     return [empty] * 7
 
-                numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-                cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
-                date_cols = [c for c in df.columns if "datetime" in str(df[c].dtype)]
-
-                # Add string-based date-like columns
-                date_keywords = ["date", "time", "timestamp", "created", "updated"]
-                for col in df.columns:
-                    if col not in date_cols:
-                        if any(keyword in col.lower() for keyword in date_keywords):
-                            date_cols.append(col)
-                            if col in cat_cols:
-                                cat_cols.remove(col)
-
-                # Exclude ID-like columns from distribution charts
-                id_keywords = ["id", "invoice", "code", "number", "no", "num"]
-                numeric_for_dist = [
-                    col for col in numeric_cols
-                    if not any(keyword in col.lower() for keyword in id_keywords)
-                ]
-                if not numeric_for_dist:
-                    numeric_for_dist = numeric_cols
+                numeric_cols = cols["numeric"]
 
                 return (
-                    gr.update(choices=date_cols),
+                    gr.update(choices=cols["date"]),
                     gr.update(choices=numeric_cols),
-                    gr.update(choices=numeric_for_dist),
-                    gr.update(choices=cat_cols),
+                    gr.update(choices=cols["numeric_for_dist"]),
+                    gr.update(choices=cols["categorical"]),
                     gr.update(choices=numeric_cols),
                     gr.update(choices=numeric_cols),
                     gr.update(choices=numeric_cols),
                 )
 
-            file_input.change(
+            upload_event.then(
                 fn=setup_viz_dropdowns,
-                inputs=df_state,
+                inputs=cols_state,
                 outputs=[
                     ts_date_col,
                     ts_value_col,
@@ -471,7 +556,7 @@ def create_dashboard():
             )
             viz_load_btn.click(
                 fn=setup_viz_dropdowns,
-                inputs=df_state,
+                inputs=cols_state,
                 outputs=[
                     ts_date_col,
                     ts_value_col,
@@ -484,9 +569,20 @@ def create_dashboard():
             )
 
             # Visualization generation
+            def time_series_plot(df, dates, date_col, value_col, agg):
+                """Plots the time series, reusing the dates parsed at upload for datetime columns."""
+                parsed = None
+                if df is not None and dates and date_col in df.columns and df[date_col].dtype.kind == "M":
+                    parsed = dates.get(date_col)
+                # Text date columns are left to create_time_series_plot, which
+                # parses them day-first like clean_and_infer_types
+                return create_time_series_plot(
+                    df, date_col, value_col, agg, dates=parsed, max_points=MAX_TIME_SERIES_POINTS
+                )
+
             ts_btn.click(
-                fn=create_time_series_plot,
-                inputs=[df_state, ts_date_col, ts_value_col, ts_agg],
+                fn=time_series_plot,
+                inputs=[df_state, dates_state, ts_date_col, ts_value_col, ts_agg],
                 outputs=ts_plot,
             )
 
@@ -504,15 +600,40 @@ def create_dashboard():
                 outputs=cat_plot,
             )
 
+            def sample_scatter_data(df, x_col, y_col):
+                """Returns at most MAX_SCATTER_POINTS rows of the two plotted columns."""
+                if df is None or not x_col or not y_col:
+                    return None
+
+                # Pick row positions from the validity mask first so that only
+                # the sampled rows of the two columns are gathered
+                rows = np.flatnonzero(df[x_col].notna().to_numpy() & df[y_col].notna().to_numpy())
+                if len(rows) > MAX_SCATTER_POINTS:
+                    rng = np.random.default_rng(0)
+                    rows = np.sort(rng.choice(rows, size=MAX_SCATTER_POINTS, replace=False))
+
+                columns = list(dict.fromkeys([x_col, y_col]))
+                return df.iloc[rows, df.columns.get_indexer(columns)]
+
             scatter_btn.click(
-                fn=lambda df, x, y: create_scatter_plot(df, x, y, MAX_SCATTER_POINTS),
+                fn=lambda df, x, y: create_scatter_plot(
+                    sample_scatter_data(df, x, y), x, y, MAX_SCATTER_POINTS
+                ),
                 inputs=[df_state, scatter_x, scatter_y],
                 outputs=scatter_plot,
             )
 
+            def correlation_heatmap(df, cache):
+                """Plots the correlation heatmap, reusing the Statistics tab result if cached."""
+                if df is None:
+                    return None
+                cached = cache.get((id(df), df.shape)) if cache else None
+                corr = cached[3] if cached else None
+                return create_correlation_heatmap(df, corr=corr)
+
             corr_btn.click(
-                fn=create_correlation_heatmap,
-                inputs=[df_state],
+                fn=correlation_heatmap,
+                inputs=[df_state, stats_cache],
                 outputs=scatter_plot,
             )
 
@@ -529,16 +650,16 @@ def create_dashboard():
 
             png_output = gr.File(label="Download PNG")
 
-            def export_time_series_png(df, date_col, value_col, agg):
+            def export_time_series_png(df, dates, date_col, value_col, agg):
                 """Exports a time series plot as a PNG file."""
-                fig = create_time_series_plot(df, date_col, value_col, agg)
+                fig = time_series_plot(df, dates, date_col, value_col, agg)
                 if fig is None:
                     return None
                 return save_plot_as_png(fig, "time_series.png")
 
             export_ts_btn.click(
                 fn=export_time_series_png,
-                inputs=[df_state, ts_date_col, ts_value_col, ts_agg],
+                inputs=[df_state, dates_state, ts_date_col, ts_value_col, ts_agg],
                 outputs=png_output,
             )
 
@@ -570,7 +691,8 @@ def create_dashboard():
 
             def export_scatter_png(df, x_col, y_col):
                 """Exports a scatter plot as a PNG file."""
-                fig = create_scatter_plot(df, x_col, y_col, MAX_SCATTER_POINTS)
+                sample = sample_scatter_data(df, x_col, y_col)
+                fig = create_scatter_plot(sample, x_col, y_col, MAX_SCATTER_POINTS)
                 if fig is None:
                     return None
                 return save_plot_as_png(fig, "scatter_plot.png")
@@ -603,9 +725,13 @@ def create_dashboard():
             gr.Markdown("Trends and Anomalies")
             anomalies_output = gr.Markdown()
 
+            def generate_insights(df, cols):
+                """Generates insights using the column types classified at upload."""
+                return generate_all_insights(df, column_types=cols.get("by_dtype") if cols else None)
+
             insights_btn.click(
-                fn=generate_all_insights,
-                inputs=df_state,
+                fn=generate_insights,
+                inputs=[df_state, cols_state],
                 outputs=[top_performers, bottom_performers, anomalies_output],
             )
 
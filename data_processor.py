@@ -1,16 +1,84 @@
+import importlib.util
+import re
+import tempfile
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
+from pandas.api.types import infer_dtype
+
+# Rust-based Excel reader, used when the optional package is installed
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+# Column name fragments that mark a column as a date candidate
+DATE_NAME_RE = re.compile(r"date|time|created|updated|timestamp", re.IGNORECASE)
+
+# Memory budget for correlation blocks; larger outputs are backed by a temp file
+CORR_MAX_MEMORY_BYTES = 256 * 1024 ** 2
+
+
+def read_delimited(file, sep=",", nrows=None):
+    """
+    Read a delimited text file, preferring the multithreaded pyarrow parser.
 
+    Falls back to the default pandas parser if pyarrow is unavailable, cannot
+    parse the file, or finds no data rows (pyarrow types the columns of a
+    header-only file as float). ISO dates that pyarrow reads as
+    ``datetime.date`` objects are converted to datetime64.
 
-def load_data(file):
+    Parameters
+    ----------
+    file : str or file-like object
+        Path or buffer of the file to read.
+    sep : str, optional
+        Field delimiter.
+    nrows : int, optional
+        Number of rows to read. The pyarrow parser reads whole files, so the
+        default parser is used when this is set.
+
+    Returns
+    -------
+    DataFrame
+        Parsed dataset.
     """
-    Load a CSV or Excel file and return a cleaned pandas DataFrame.
+    if nrows is not None:
+        return pd.read_csv(file, sep=sep, nrows=nrows)
+
+    try:
+        df = pd.read_csv(file, sep=sep, engine="pyarrow")
+    except (ImportError, ValueError):
+        df = None
+
+    if df is None or len(df.index) == 0:
+        if hasattr(file, "seek"):
+            file.seek(0)
+        return pd.read_csv(file, sep=sep)
+
+    dates = {
+        col: pd.to_datetime(df[col])
+        for col in df.columns[df.dtypes == object]
+        if infer_dtype(df[col], skipna=True) == "date"
+    }
+    if dates:
+        df = df.copy(deep=False)
+        for col, values in dates.items():
+            df[col] = values
+
+    return df
+
+
+def load_data(file, nrows=None):
+    """
+    Load a CSV, TSV, or Excel file and return a cleaned pandas DataFrame.
     Performs basic type inference and sanitization after loading.
     
     Parameters
     ----------
     file : file-like object
-        The uploaded file. Must be CSV or Excel format.
+        The uploaded file. Must be CSV, TSV, or Excel format.
+    nrows : int, optional
+        Read only the first ``nrows`` rows, e.g. for a quick preview.
 
     Returns
     -------
@@ -24,11 +92,13 @@ def load_data(file):
     """
     try:
         if file.name.endswith(".csv"):
-            df = pd.read_csv(file)
+            df = read_delimited(file, nrows=nrows)
+        elif file.name.endswith(".tsv"):
+            df = read_delimited(file, sep="\t", nrows=nrows)
         elif file.name.endswith((".xlsx", ".xls")):
-            df = pd.read_excel(file)
+            df = pd.read_excel(file, engine=EXCEL_ENGINE, nrows=nrows)
         else:
-            raise ValueError("Unsupported file format. Please upload CSV or Excel.")
+            raise ValueError("Unsupported file format. Please upload CSV, TSV, or Excel.")
         
         df = clean_and_infer_types(df)
         return df
@@ -56,36 +126,118 @@ def clean_and_infer_types(df):
     DataFrame
         Dataset with improved data types.
     """
-    df = df.copy()
+    # Only object columns can need conversion; datetime and numeric
+    # columns are already typed
+    object_positions = [i for i, dtype in enumerate(df.dtypes) if dtype.kind == "O"]
+
+    converted = {}
+    for i in object_positions:
+        likely_date = DATE_NAME_RE.search(str(df.columns[i])) is not None
+
+        # Date-named columns are only tried as dates, all others as numbers
+        values = df.iloc[:, i]
+        try:
+            if likely_date:
+                result = pd.to_datetime(values, dayfirst=True, errors="coerce")
+            else:
+                result = pd.to_numeric(values, errors="coerce")
+        except (TypeError, ValueError):
+            continue
+
+        if result.notna().mean() > 0.5:
+            converted[i] = result
+
+    if not converted:
+        return df
+
+    # Assemble the result in one step instead of replacing columns one by one;
+    # unchanged columns are reused without copying, so the input is not modified
+    columns = [converted.get(i, df.iloc[:, i]) for i in range(df.shape[1])]
+    result = pd.concat(columns, axis=1, copy=False)
+    result.columns = df.columns
+    return result
+
+
+def convert_to_categorical(df, max_unique_ratio=0.5, max_unique=100_000, exclude=None):
+    """
+    Convert low-cardinality object columns to the category dtype.
+
+    Category columns store integer codes instead of Python strings, which
+    makes repeated filtering, grouping, and unique-value lookups cheaper.
+
+    Parameters
+    ----------
+    df : DataFrame
+        Input dataset.
+    max_unique_ratio : float, optional
+        Maximum ratio of unique values to rows for a column to be converted.
+    max_unique : int, optional
+        Maximum number of unique values for a column to be converted.
+    exclude : list, optional
+        Columns to leave unchanged.
 
-    for col in df.columns:
-        col_lower = col.lower()
+    Returns
+    -------
+    DataFrame
+        Dataset with low-cardinality object columns stored as categories.
+    """
+    if df is None or df.empty:
+        return df
 
-        date_indicators = ["date", "time", "created", "updated", "timestamp"]
-        likely_date = any(ind in col_lower for ind in date_indicators)
+    exclude = set(exclude or [])
+    converted = {}
 
-        # Preserve existing datetime columns
-        if pd.api.types.is_datetime64_any_dtype(df[col]):
+    for col in df.select_dtypes(include=["object"]).columns:
+        if col in exclude:
             continue
 
-        # Attempt datetime conversion for likely date columns
-        if likely_date and df[col].dtype == "object":
-            try:
-                converted = pd.to_datetime(df[col], dayfirst=True, errors="coerce")
-                if converted.notna().mean() > 0.5:
-                    df[col] = converted
-                    continue
-            except Exception:
-                pass
-
-        # Attempt numeric conversion
-        if df[col].dtype == "object" and not likely_date:
-            try:
-                converted = pd.to_numeric(df[col], errors="coerce")
-                if converted.notna().mean() > 0.5:
-                    df[col] = converted
-            except Exception:
-                pass
+        n_unique = df[col].nunique(dropna=True)
+        if n_unique < max_unique and n_unique / len(df) < max_unique_ratio:
+            converted[col] = df[col].astype("category")
+
+    if converted:
+        # assign() deep-copies every column; a shallow copy only rebinds the
+        # converted ones and leaves the input unchanged
+        df = df.copy(deep=False)
+        for col, values in converted.items():
+            df[col] = values
+
+    return df
+
+
+def downcast_numeric(df):
+    """
+    Downcast integer columns to the smallest dtype that holds their values.
+
+    Integer columns are reduced to the smallest signed integer type, which
+    pandas widens again when summing. Float columns are kept as float64:
+    even when every value round-trips through float32, sums and means
+    accumulated in float32 lose precision.
+
+    Parameters
+    ----------
+    df : DataFrame
+        Input dataset.
+
+    Returns
+    -------
+    DataFrame
+        Dataset with downcast numeric columns.
+    """
+    if df is None or df.empty:
+        return df
+
+    converted = {}
+
+    for col in df.select_dtypes(include=["integer"]).columns:
+        values = pd.to_numeric(df[col], downcast="integer")
+        if values.dtype != df[col].dtype:
+            converted[col] = values
+
+    if converted:
+        df = df.copy(deep=False)
+        for col, values in converted.items():
+            df[col] = values
 
     return df
 
@@ -106,7 +258,7 @@ def get_basic_info(df):
     return {
         "Shape": list(df.shape),
         "Columns": list(df.columns),
-        "Data Types": df.dtypes.astype(str).to_dict(),
+        "Data Types": dict(zip(df.columns, map(str, df.dtypes))),
     }
 
 
@@ -128,13 +280,21 @@ def preview_data(df, n=5):
     return df.head(n)
 
 
-def numeric_summary(df):
+def numeric_summary(df, include_index=False):
     """
     Generate descriptive statistics for numeric columns.
+
+    Produces the same rows as ``DataFrame.describe`` (count, mean, std, min,
+    quartiles, max) from one float64 array. Each column is sorted once with
+    missing values moved to the end, and the quartiles are read off with
+    linear interpolation over the non-missing prefix.
     
     Parameters
     ----------
     df : DataFrame
+    include_index : bool, optional
+        If True, return the column names as a leading "Metric" column
+        instead of the index, ready for display.
 
     Returns
     -------
@@ -144,10 +304,57 @@ def numeric_summary(df):
     numeric_df = df.select_dtypes(include=["number"])
     if numeric_df.empty:
         return pd.DataFrame()
-    return numeric_df.describe().T
+
+    values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+    count = np.count_nonzero(~np.isnan(values), axis=0)
+
+    with warnings.catch_warnings(), np.errstate(invalid="ignore"):
+        # Empty and single-value columns produce NaN statistics, as in describe
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0, ddof=1)
+
+        ordered = np.sort(values, axis=0)
+        cols = np.arange(values.shape[1])
+        quantiles = []
+        for q in (0.0, 0.25, 0.5, 0.75, 1.0):
+            position = q * (count - 1)
+            lower = np.floor(position).astype(np.intp)
+            upper = np.minimum(lower + 1, count - 1)
+            low_vals = ordered[lower.clip(0), cols]
+            high_vals = ordered[upper.clip(0), cols]
+            if q in (0.0, 1.0):
+                # min and max are read directly so infinite values survive
+                value = low_vals
+            else:
+                # Interpolate towards the next value from the nearer end, as
+                # numpy.quantile does, so infinite neighbours give the same
+                # results as describe
+                t = position - lower
+                diff = high_vals - low_vals
+                value = np.where(t >= 0.5, high_vals - diff * (1 - t), low_vals + diff * t)
+            quantiles.append(np.where(count > 0, value, np.nan))
+
+    summary = pd.DataFrame(
+        {
+            "count": count.astype(np.float64),
+            "mean": mean,
+            "std": std,
+            "min": quantiles[0],
+            "25%": quantiles[1],
+            "50%": quantiles[2],
+            "75%": quantiles[3],
+            "max": quantiles[4],
+        },
+        index=numeric_df.columns,
+    )
+    if include_index:
+        summary.insert(0, "Metric", summary.index)
+        summary.index = pd.RangeIndex(len(summary))
+    return summary
 
 
-def categorical_summary(df):
+def categorical_summary(df, max_columns=None):
     """
     Generate a summary for categorical columns.
 
@@ -158,6 +365,9 @@ def categorical_summary(df):
     Parameters
     ----------
     df : DataFrame
+    max_columns : int, optional
+        If set, only the columns with the most unique values are summarized
+        and the number of omitted columns is reported under "_omitted_columns".
 
     Returns
     -------
@@ -165,38 +375,141 @@ def categorical_summary(df):
         Summary statistics for categorical columns.
     """
     cat_df = df.select_dtypes(include=["object", "category"])
-    summary = {}
+    counted = {col: _count_values(cat_df[col]) for col in cat_df.columns}
 
-    for col in cat_df.columns:
-        mode_vals = cat_df[col].mode()
+    columns = list(counted)
+    omitted = 0
+    if max_columns is not None and len(columns) > max_columns:
+        omitted = len(columns) - max_columns
+        n_unique = pd.Series({col: counted[col][0] for col in columns})
+        columns = n_unique.nlargest(max_columns).index
+
+    summary = {}
+    for col in columns:
+        n_unique, most_frequent = counted[col]
         summary[col] = {
-            "Unique Values": int(cat_df[col].nunique()),
-            "Most Frequent": mode_vals.iloc[0] if len(mode_vals) > 0 else None,
+            "Unique Values": n_unique,
+            "Most Frequent": most_frequent,
         }
 
+    if omitted:
+        summary["_omitted_columns"] = omitted
     return summary
 
 
-def missing_values_report(df):
+def _count_values(series):
+    """
+    Count the distinct values of a column and find the most frequent one.
+
+    Both results come from a single counting pass: ``np.bincount`` over the
+    integer codes for category columns, ``value_counts`` otherwise. Ties
+    resolve to the first value in sort order, as with ``Series.mode``.
+
+    Parameters
+    ----------
+    series : Series
+
+    Returns
+    -------
+    tuple
+        ``(unique_count, most_frequent)``, where ``most_frequent`` is None if
+        the column is entirely missing.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        codes = codes[codes >= 0]
+        if len(codes) == 0:
+            return 0, None
+        counts = np.bincount(codes, minlength=len(series.cat.categories))
+        return int(np.count_nonzero(counts)), series.cat.categories[np.argmax(counts)]
+
+    counts = series.value_counts()
+    if counts.empty:
+        return 0, None
+
+    tied = counts.index[counts.to_numpy() == counts.iloc[0]]
+    try:
+        most_frequent = min(tied)
+    except TypeError:
+        # Mixed value types cannot be ordered
+        most_frequent = tied[0]
+    return len(counts), most_frequent
+
+
+def missing_values_report(df, max_columns=None):
     """
     Return the number of missing values for each column.
 
     Parameters
     ----------
     df : DataFrame
+    max_columns : int, optional
+        If set, only the columns with the most missing values are reported
+        and the number of omitted columns is given under "_omitted_columns".
 
     Returns
     -------
     dict
         Missing value counts per column.
     """
-    return {col: int(count) for col, count in df.isnull().sum().items()}
+    counts = df.isnull().sum()
+
+    omitted = 0
+    if max_columns is not None and len(counts) > max_columns:
+        omitted = len(counts) - max_columns
+        counts = counts.nlargest(max_columns)
+
+    # tolist converts the counts to Python ints in one call
+    report = dict(zip(counts.index, counts.to_numpy().tolist()))
+    if omitted:
+        report["_omitted_columns"] = omitted
+    return report
+
+
+def compute_all_stats(df, max_columns=None):
+    """
+    Compute the numeric, categorical, missing-value, and correlation summaries.
+
+    The numeric and categorical column subsets are selected once and shared
+    by the summaries, which run concurrently since they only read the data
+    and NumPy releases the GIL in the heavy reductions.
+
+    Parameters
+    ----------
+    df : DataFrame
+    max_columns : int, optional
+        Column limit passed to ``categorical_summary`` and
+        ``missing_values_report``.
+
+    Returns
+    -------
+    tuple
+        ``(numeric, categorical, missing, correlation)`` where the numeric
+        summary includes the "Metric" column.
+    """
+    numeric_df = df.select_dtypes(include=["number"])
+    cat_df = df.select_dtypes(include=["object", "category"])
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        num = pool.submit(numeric_summary, numeric_df, include_index=True)
+        cat = pool.submit(categorical_summary, cat_df, max_columns=max_columns)
+        missing = pool.submit(missing_values_report, df, max_columns=max_columns)
+        corr = pool.submit(correlation_matrix, numeric_df)
+
+    return num.result(), cat.result(), missing.result(), corr.result()
 
 
 def correlation_matrix(df):
     """
     Compute the correlation matrix for numeric columns.
 
+    Columns are centered once in float64 and the pairwise products are
+    computed as float32 matrix multiplications over blocks of columns, so
+    only a bounded amount of intermediate memory is live at a time. Missing
+    values are handled pairwise, matching ``DataFrame.corr``. Matrices larger
+    than ``CORR_MAX_MEMORY_BYTES`` are written to a temporary memory-mapped
+    file.
+
     Parameters
     ----------
     df : DataFrame
@@ -209,4 +522,81 @@ def correlation_matrix(df):
     numeric_df = df.select_dtypes(include=["number"])
     if numeric_df.empty:
         return pd.DataFrame()
-    return numeric_df.corr()
+
+    values = numeric_df.to_numpy(dtype=np.float64)
+    has_missing = np.isnan(values).any()
+    n_cols = values.shape[1]
+
+    if n_cols * n_cols * 4 > CORR_MAX_MEMORY_BYTES:
+        # The mapping stays valid after the anonymous temp file is closed
+        with tempfile.TemporaryFile() as buffer:
+            corr = np.memmap(buffer, dtype=np.float32, shape=(n_cols, n_cols))
+    else:
+        corr = np.empty((n_cols, n_cols), dtype=np.float32)
+    block_size = max(64, int(np.sqrt(CORR_MAX_MEMORY_BYTES / 8 / n_cols)))
+
+    with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+        # All-missing columns produce NaN means and NaN correlations
+        warnings.simplefilter("ignore", RuntimeWarning)
+        centered = (values - np.nanmean(values, axis=0)).astype(np.float32)
+        if not has_missing:
+            # Normalized columns turn each block into a single GEMM
+            centered /= np.linalg.norm(centered, axis=0)
+
+        for i in range(0, n_cols, block_size):
+            left = centered[:, i:i + block_size]
+            # The matrix is symmetric, so only upper-triangle blocks are computed
+            for j in range(i, n_cols, block_size):
+                right = centered[:, j:j + block_size]
+                if has_missing:
+                    block = _pairwise_correlation(left, right)
+                else:
+                    block = left.T @ right
+
+                # Float32 roundoff can push values slightly past +/-1
+                np.clip(block, -1.0, 1.0, out=block)
+                if i == j:
+                    diagonal = np.diag(block)
+                    np.fill_diagonal(block, np.where(np.isnan(diagonal), np.nan, 1.0))
+                corr[i:i + block_size, j:j + block_size] = block
+                if i != j:
+                    corr[j:j + block_size, i:i + block_size] = block.T
+
+    return pd.DataFrame(corr, index=numeric_df.columns, columns=numeric_df.columns)
+
+
+def _pairwise_correlation(left, right):
+    """
+    Compute pairwise-complete correlations between two column blocks.
+
+    For each pair of columns only rows where both values are present are
+    used. The required counts, sums, and sums of squares are obtained as
+    matrix products of the zero-filled values and the presence masks.
+
+    Parameters
+    ----------
+    left, right : ndarray
+        Column-centered float32 values, with NaN for missing entries.
+
+    Returns
+    -------
+    ndarray
+        Correlation block with NaN where fewer than two rows overlap.
+    """
+    present_l = (~np.isnan(left)).astype(np.float32)
+    present_r = (~np.isnan(right)).astype(np.float32)
+    x = np.nan_to_num(left, nan=0.0)
+    y = np.nan_to_num(right, nan=0.0)
+
+    n = present_l.T @ present_r             # rows where both columns are present
+    sum_x = x.T @ present_r
+    sum_y = present_l.T @ y
+    sum_xx = (x * x).T @ present_r
+    sum_yy = present_l.T @ (y * y)
+    sum_xy = x.T @ y
+
+    cov = sum_xy - sum_x * sum_y / n
+    var_x = sum_xx - sum_x ** 2 / n
+    var_y = sum_yy - sum_y ** 2 / n
+
+    return cov / np.sqrt(var_x * var_y)
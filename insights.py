@@ -4,9 +4,28 @@ Provides functions for analyzing trends, anomalies, and summary patterns
 in tabular datasets.
 """
 
+import re
+import warnings
+
 import pandas as pd
 import numpy as np
 
+from utils import get_filter_options
+
+# Rows sampled to estimate the memory held by Python string objects
+MEMORY_SAMPLE_ROWS = 10_000
+
+# Column name patterns used to pick the analyzed columns
+NON_NEGATIVE_RE = re.compile(r"quantity|amount|price|sales", re.IGNORECASE)
+VALUE_RE = re.compile(
+    r"quantity|amount|sales|revenue|price|total|weekly|monthly|cost|profit|value",
+    re.IGNORECASE,
+)
+GROUP_RE = re.compile(
+    r"country|product|category|customer|description|name|store|region|city|state|department",
+    re.IGNORECASE,
+)
+
 
 def identify_top_bottom_performers(df, group_col, value_col, n=10):
     """
@@ -31,12 +50,17 @@ def identify_top_bottom_performers(df, group_col, value_col, n=10):
     if df is None or not group_col or not value_col:
         return None, None
 
-    grouped = df.groupby(group_col)[value_col].sum().sort_values(ascending=False)
+    grouped = df.groupby(group_col, observed=True)[value_col].sum()
 
-    top_n = grouped.head(n).reset_index()
+    # Partial selection instead of sorting every group; only the selected
+    # rows are sorted, stably, so tied groups keep their key order and the
+    # bottom rows are the tail of the full descending ranking
+    top = grouped.nlargest(n).sort_index()
+    top_n = top.sort_values(ascending=False, kind="stable").reset_index()
     top_n.columns = [group_col, f"Total {value_col}"]
 
-    bottom_n = grouped.tail(n).reset_index()
+    bottom = grouped.nsmallest(n, keep="last").sort_index()
+    bottom_n = bottom.sort_values(ascending=False, kind="stable").reset_index()
     bottom_n.columns = [group_col, f"Total {value_col}"]
 
     return top_n, bottom_n
@@ -74,7 +98,7 @@ def detect_missing_values(df):
     return "\n".join(insights)
 
 
-def detect_anomalies(df, n_std=3):
+def detect_anomalies(df, n_std=3, column_types=None):
     """
     Detect potential anomalies in numeric columns using simple heuristic checks.
 
@@ -83,6 +107,8 @@ def detect_anomalies(df, n_std=3):
     df : DataFrame
     n_std : int, optional
         Number of standard deviations used to flag outliers.
+    column_types : tuple, optional
+        Precomputed result of ``utils.get_filter_options``.
 
     Returns
     -------
@@ -92,27 +118,38 @@ def detect_anomalies(df, n_std=3):
     if df is None:
         return ""
 
-    insights = []
-    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-
-    for col in numeric_cols[:5]:
-        col_lower = col.lower()
+    if column_types is None:
+        column_types = get_filter_options(df)
 
+    insights = []
+    numeric_cols = column_types[0][:5]
+    if not numeric_cols:
+        return "**No significant anomalies detected.**"
+
+    # Compute the checks for all inspected columns in one pass over a float64 block
+    values = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    with warnings.catch_warnings(), np.errstate(invalid="ignore"):
+        # Empty and single-value columns yield NaN statistics and are skipped below
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0, ddof=1)
+        neg_counts = np.count_nonzero(values < 0, axis=0)
+        outlier_counts = np.count_nonzero(
+            (values < mean - n_std * std) | (values > mean + n_std * std), axis=0
+        )
+
+    for i, col in enumerate(numeric_cols):
         # Detect unexpected negative values
-        if any(word in col_lower for word in ["quantity", "amount", "price", "sales"]):
-            neg_count = (df[col] < 0).sum()
+        if NON_NEGATIVE_RE.search(str(col)):
+            neg_count = neg_counts[i]
             if neg_count > 0:
                 insights.append(
                     f"**Anomaly:** {col} contains {neg_count:,} negative values."
                 )
 
         # Detect statistical outliers
-        mean = df[col].mean()
-        std = df[col].std()
-
-        if std > 0:
-            outliers = ((df[col] < mean - n_std * std) |
-                        (df[col] > mean + n_std * std)).sum()
+        if std[i] > 0:
+            outliers = outlier_counts[i]
             if 0 < outliers < len(df) * 0.1:
                 pct = (outliers / len(df) * 100).round(1)
                 insights.append(
@@ -122,13 +159,15 @@ def detect_anomalies(df, n_std=3):
     return "\n".join(insights) if insights else "**No significant anomalies detected.**"
 
 
-def analyze_date_trends(df):
+def analyze_date_trends(df, column_types=None):
     """
     Analyze temporal patterns when a datetime column is available.
 
     Parameters
     ----------
     df : DataFrame
+    column_types : tuple, optional
+        Precomputed result of ``utils.get_filter_options``.
 
     Returns
     -------
@@ -138,19 +177,31 @@ def analyze_date_trends(df):
     if df is None:
         return ""
 
+    if column_types is None:
+        column_types = get_filter_options(df)
+
     insights = []
-    date_cols = [c for c in df.columns if "datetime" in str(df[c].dtype)]
+    date_cols = column_types[2]
 
     if date_cols:
         date_col = date_cols[0]
 
-        date_range = df[date_col].max() - df[date_col].min()
-        min_date = df[date_col].min().strftime("%Y-%m-%d")
-        max_date = df[date_col].max().strftime("%Y-%m-%d")
+        first, last = df[date_col].min(), df[date_col].max()
+        date_range = last - first
+        min_date = first.strftime("%Y-%m-%d")
+        max_date = last.strftime("%Y-%m-%d")
 
         insights.append(f"**Date Range:** {min_date} to {max_date} ({date_range.days} days).")
 
-        daily_counts = df.groupby(df[date_col].dt.date).size()
+        # Bucket by calendar day on the datetime64 values instead of boxing
+        # a Python date object per row
+        dates = df[date_col]
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        days = dates.to_numpy().astype("datetime64[D]")
+        # np.unique returns the days in order, so ties go to the earliest day
+        unique_days, counts = np.unique(days[~np.isnat(days)], return_counts=True)
+        daily_counts = pd.Series(counts, index=unique_days.astype(object))
 
         busiest_day = daily_counts.idxmax()
         slowest_day = daily_counts.idxmin()
@@ -161,13 +212,46 @@ def analyze_date_trends(df):
     return "\n".join(insights) if insights else ""
 
 
-def generate_dataset_summary(df):
+def estimate_memory_usage(df, sample_rows=MEMORY_SAMPLE_ROWS):
+    """
+    Estimate the memory used by a DataFrame, including Python objects.
+
+    Typed columns are measured exactly. Object columns would require sizing
+    every stored Python object, so on large datasets their size is
+    extrapolated from a fixed random sample of rows instead.
+
+    Parameters
+    ----------
+    df : DataFrame
+    sample_rows : int, optional
+        Number of rows sampled for object columns.
+
+    Returns
+    -------
+    tuple
+        ``(bytes, estimated)`` where ``estimated`` is True if sampling was used.
+    """
+    object_mask = (df.dtypes == object).to_numpy()
+    if len(df) <= sample_rows or not object_mask.any():
+        return int(df.memory_usage(deep=True).sum()), False
+
+    # The typed columns and the index are sized exactly
+    typed_bytes = df.iloc[:, ~object_mask].memory_usage(deep=True).sum()
+
+    sample = df.iloc[:, object_mask].sample(n=sample_rows, random_state=0)
+    sample_bytes = sample.memory_usage(deep=True, index=False).sum()
+    return int(typed_bytes + sample_bytes * len(df) / sample_rows), True
+
+
+def generate_dataset_summary(df, column_types=None):
     """
     Generate general dataset summary statistics.
 
     Parameters
     ----------
     df : DataFrame
+    column_types : tuple, optional
+        Precomputed result of ``utils.get_filter_options``.
 
     Returns
     -------
@@ -180,22 +264,23 @@ def generate_dataset_summary(df):
     insights = []
     insights.append(f"**Dataset Size:** {len(df):,} rows, {len(df.columns)} columns.")
 
-    memory_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
-    insights.append(f"**Memory Usage:** {memory_mb:.2f} MB.")
+    memory_bytes, estimated = estimate_memory_usage(df)
+    approx = "~" if estimated else ""
+    insights.append(f"**Memory Usage:** {approx}{memory_bytes / 1024 ** 2:.2f} MB.")
 
-    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-    cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
-    date_cols = [c for c in df.columns if "datetime" in str(df[c].dtype)]
+    if column_types is None:
+        column_types = get_filter_options(df)
 
     insights.append(
-        f"**Column Types:** {len(numeric_cols)} numeric, "
-        f"{len(cat_cols)} categorical, {len(date_cols)} datetime."
+        f"**Column Types:** {len(column_types[0])} numeric, "
+        f"{len(column_types[1])} categorical, "
+        f"{len(column_types[2])} datetime."
     )
 
     return "\n".join(insights)
 
 
-def generate_all_insights(df):
+def generate_all_insights(df, column_types=None):
     """
     Produce a comprehensive insight summary including:
     - top and bottom performers
@@ -207,6 +292,9 @@ def generate_all_insights(df):
     Parameters
     ----------
     df : DataFrame
+    column_types : tuple, optional
+        Precomputed result of ``utils.get_filter_options``, shared by every
+        helper. Computed from ``df`` if omitted.
 
     Returns
     -------
@@ -218,9 +306,13 @@ def generate_all_insights(df):
 
     insights_sections = []
 
+    # Group the columns once and share the result with every helper
+    if column_types is None:
+        column_types = get_filter_options(df)
+
     # Determine candidate numeric columns
-    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-    cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+    numeric_cols = column_types[0]
+    cat_cols = list(column_types[1])
 
     # Treat low-cardinality numeric columns as categorical
     for col in numeric_cols[:]:
@@ -232,11 +324,7 @@ def generate_all_insights(df):
     numeric_only = numeric_cols
 
     for col in numeric_only:
-        if any(keyword in col.lower() for keyword in [
-            "quantity", "amount", "sales", "revenue",
-            "price", "total", "weekly", "monthly",
-            "cost", "profit", "value"
-        ]):
+        if VALUE_RE.search(str(col)):
             value_col = col
             break
 
@@ -246,12 +334,7 @@ def generate_all_insights(df):
     # Identify grouping column
     group_col = None
     for col in cat_cols:
-        col_lower = col.lower()
-        if any(keyword in col_lower for keyword in [
-            "country", "product", "category", "customer",
-            "description", "name", "store", "region",
-            "city", "state", "department"
-        ]):
+        if GROUP_RE.search(str(col)):
             group_col = col
             break
 
@@ -264,12 +347,13 @@ def generate_all_insights(df):
     if value_col and group_col and value_col != group_col:
         try:
             top_df, bottom_df = identify_top_bottom_performers(df, group_col, value_col, n=10)
-            grouped = df.groupby(group_col)[value_col].sum().sort_values(ascending=False)
+            top_name, top_total = top_df.iloc[0]
+            bottom_name, bottom_total = bottom_df.iloc[-1]
             insights_sections.append(
-                f"**Top Performer:** {grouped.index[0]} with {grouped.iloc[0]:,.0f} total {value_col}."
+                f"**Top Performer:** {top_name} with {top_total:,.0f} total {value_col}."
             )
             insights_sections.append(
-                f"**Bottom Performer:** {grouped.index[-1]} with {grouped.iloc[-1]:,.0f} total {value_col}."
+                f"**Bottom Performer:** {bottom_name} with {bottom_total:,.0f} total {value_col}."
             )
         except Exception:
             pass
@@ -278,14 +362,14 @@ def generate_all_insights(df):
     insights_sections.append(detect_missing_values(df))
 
     # Anomalies
-    insights_sections.append(detect_anomalies(df))
+    insights_sections.append(detect_anomalies(df, column_types=column_types))
 
     # Date trends
-    date_info = analyze_date_trends(df)
+    date_info = analyze_date_trends(df, column_types=column_types)
     if date_info:
         insights_sections.append(date_info)
 
     # Dataset summary
-    insights_sections.append(generate_dataset_summary(df))
+    insights_sections.append(generate_dataset_summary(df, column_types=column_types))
 
     return top_df, bottom_df, "\n\n".join(insights_sections)
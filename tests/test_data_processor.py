@@ -0,0 +1,59 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from data_processor import downcast_numeric, numeric_summary, read_delimited
+from insights import identify_top_bottom_performers
+
+
+def test_downcast_keeps_float_sums_exact():
+    n = 2_000_000
+    df = pd.DataFrame({
+        "Region": np.where(np.arange(n) % 2 == 0, "East", "West"),
+        "Sales": np.full(n, 33.0) + (np.arange(n) % 7 == 0),
+    })
+    expected = df.groupby("Region")["Sales"].sum()
+
+    result = downcast_numeric(df)
+
+    assert result["Sales"].dtype == np.float64
+    top, _ = identify_top_bottom_performers(result, "Region", "Sales")
+    totals = dict(zip(top["Region"], top["Total Sales"]))
+    assert totals == expected.to_dict()
+
+
+def test_downcast_shrinks_integer_columns():
+    df = pd.DataFrame({"Quantity": np.arange(100, dtype=np.int64)})
+    assert downcast_numeric(df)["Quantity"].dtype == np.int8
+
+
+def test_numeric_summary_matches_describe_with_infinite_values():
+    df = pd.DataFrame({
+        "a": [-np.inf, 1.0, 2.0, np.nan],
+        "b": [1.0, 2.0, 3.0, np.inf],
+        "c": [3.0, np.inf, np.nan, 0.0],
+    })
+
+    summary = numeric_summary(df)
+
+    assert summary.loc["a", "25%"] == -np.inf
+    expected = df.describe().T
+    quartiles = ["min", "25%", "50%", "75%", "max"]
+    np.testing.assert_array_equal(summary[quartiles].to_numpy(), expected[quartiles].to_numpy())
+
+
+def test_read_delimited_header_only_matches_default_parser():
+    result = read_delimited(io.StringIO("Region,Sales\n"))
+
+    assert result.empty
+    assert list(result.columns) == ["Region", "Sales"]
+    assert (result.dtypes == object).all()
+
+
+def test_read_delimited_converts_iso_dates_to_datetime64():
+    result = read_delimited(io.StringIO("Sales,shipped\n1,2020-01-05\n2,\n"))
+
+    assert result["shipped"].dtype.kind == "M"
+    assert result["shipped"].iloc[0] == pd.Timestamp("2020-01-05")
+    assert pd.isna(result["shipped"].iloc[1])
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from insights import identify_top_bottom_performers
+
+
+def test_top_bottom_ties_name_different_groups():
+    df = pd.DataFrame({"Product": ["z", "hello", "m"], "Sales": [5.0, 5.0, 5.0]})
+
+    top, bottom = identify_top_bottom_performers(df, "Product", "Sales")
+
+    assert top["Product"].tolist() == ["hello", "m", "z"]
+    assert bottom["Product"].tolist() == ["hello", "m", "z"]
+    assert top.iloc[0]["Product"] == "hello"
+    assert bottom.iloc[-1]["Product"] == "z"
+
+
+def test_top_bottom_ties_follow_full_ranking():
+    df = pd.DataFrame({
+        "Product": ["d", "c", "b", "a", "e"],
+        "Sales": [1.0, 2.0, 1.0, 2.0, 1.0],
+    })
+
+    top, bottom = identify_top_bottom_performers(df, "Product", "Sales", n=3)
+
+    assert top["Product"].tolist() == ["a", "c", "b"]
+    assert bottom["Product"].tolist() == ["b", "d", "e"]
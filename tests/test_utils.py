@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from data_processor import clean_and_infer_types
+from utils import classify_columns, parse_date_columns
+
+MIXED_OFFSETS = ["2024-01-01T10:00:00+01:00", "2024-01-02T10:00:00-05:00"]
+
+
+def test_parse_date_columns_skips_mixed_offsets():
+    df = pd.DataFrame({"order_date": MIXED_OFFSETS, "Sales": [1.0, 2.0]})
+
+    dates = parse_date_columns(df, ["order_date"])
+
+    assert dates == {}
+    assert df["order_date"].tolist() == MIXED_OFFSETS
+
+
+def test_parse_date_columns_after_cleaning_mixed_offsets():
+    df = clean_and_infer_types(pd.DataFrame({"order_date": MIXED_OFFSETS, "Sales": [1.0, 2.0]}))
+    cols = classify_columns(df)
+
+    dates = parse_date_columns(df, cols["date"])
+
+    for values in dates.values():
+        assert values.dtype.kind == "M"
+
+
+def test_parse_date_columns_drops_single_time_zone():
+    df = pd.DataFrame({"order_date": ["2024-01-01T10:00:00+01:00", "2024-01-02T10:00:00+01:00"]})
+
+    dates = parse_date_columns(df, ["order_date"])
+
+    assert dates["order_date"].dtype == np.dtype("datetime64[ns]")
+    assert dates["order_date"][0] == np.datetime64("2024-01-01T10:00:00")
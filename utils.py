@@ -4,7 +4,40 @@ Provides helper functions for filtering, data inspection,
 and basic column validation.
 """
 
+import functools
+import re
+
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pandas.api.types import is_datetime64_any_dtype, infer_dtype
+
+# Column name patterns used for classification
+DATE_RE = re.compile(r"date|time|timestamp|created|updated", re.IGNORECASE)
+ID_RE = re.compile(r"(?<![a-z])(?:id|invoice|code|number|no|num)(?![a-z])")
+CAMEL_CASE_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+def is_id_like(column_name):
+    """
+    Check whether a column name looks like an identifier.
+
+    Keywords must appear as whole words, where camelCase boundaries
+    count as word breaks (``CustomerID`` and ``invoice_no`` match,
+    ``incidents`` does not).
+
+    Parameters
+    ----------
+    column_name : str
+
+    Returns
+    -------
+    bool
+        True if the name contains an ID-like keyword.
+    """
+    words = CAMEL_CASE_RE.sub("_", str(column_name)).lower()
+    return ID_RE.search(words) is not None
 
 
 def get_filter_options(df):
@@ -27,16 +60,206 @@ def get_filter_options(df):
     if df is None or df.empty:
         return [], [], []
 
-    numeric = df.select_dtypes(include=["number"]).columns.tolist()
-    categorical = df.select_dtypes(include=["object", "category"]).columns.tolist()
-    date = df.select_dtypes(include=["datetime64[ns]", "datetime64", "datetime"]).columns.tolist()
+    return classify_columns(df)["by_dtype"]
+
+
+def classify_columns(df):
+    """
+    Classify dataset columns for the filter and visualization controls.
+
+    The classification is computed once per upload so that dashboard
+    callbacks can read it instead of rescanning the DataFrame dtypes.
 
-    # Additional detection for datetime-like columns
-    for col in df.columns:
-        if "datetime" in str(df[col].dtype).lower() and col not in date:
+    Parameters
+    ----------
+    df : DataFrame
+        Input dataset.
+
+    Returns
+    -------
+    dict
+        Dictionary with the following column lists:
+        - numeric: columns with numeric data types
+        - categorical: object or category columns without date-like names
+        - date: datetime columns and string columns with date-like names
+        - numeric_for_dist: numeric columns excluding ID-like names
+        - by_dtype: ``(numeric, categorical, date)`` grouped by dtype alone,
+          as returned by ``get_filter_options``
+    """
+    if df is None:
+        return {
+            "numeric": [], "categorical": [], "date": [], "numeric_for_dist": [],
+            "by_dtype": ([], [], []),
+        }
+
+    # Classify every column in a single pass over the dtypes
+    numeric, categorical, date = [], [], []
+    object_cols, datetime_cols = [], []
+    for col, dtype in df.dtypes.items():
+        kind = dtype.kind
+        if kind in "iufc":
+            numeric.append(col)
+        elif kind == "M":
             date.append(col)
+            datetime_cols.append(col)
+        elif kind == "O" or isinstance(dtype, pd.CategoricalDtype):
+            object_cols.append(col)
+            # Date-like string columns are offered as date candidates, not categories
+            if not DATE_RE.search(str(col)):
+                categorical.append(col)
+            elif kind == "O":
+                date.append(col)
+
+    # Exclude ID-like columns from distribution charts
+    numeric_for_dist = [col for col in numeric if not is_id_like(col)]
+    if not numeric_for_dist:
+        numeric_for_dist = numeric
+
+    return {
+        "numeric": numeric,
+        "categorical": categorical,
+        "date": date,
+        "numeric_for_dist": numeric_for_dist,
+        "by_dtype": (numeric, object_cols, datetime_cols),
+    }
 
-    return numeric, categorical, date
+
+def parse_date_columns(df, columns):
+    """
+    Parse date columns once into NumPy datetime64 arrays.
+
+    String columns are converted with ``pd.to_datetime`` and unparseable
+    values become NaT, so the arrays can be compared directly against
+    date bounds without re-parsing on every filter request.
+
+    Parameters
+    ----------
+    df : DataFrame
+    columns : list
+        Date or date-like columns to parse.
+
+    Returns
+    -------
+    dict
+        Mapping of column name to a datetime64 array aligned with ``df``.
+        Columns that do not parse to a single datetime dtype are omitted.
+    """
+    if df is None:
+        return {}
+
+    parsed = {}
+    for col in columns:
+        if col not in df.columns:
+            continue
+
+        values = df[col]
+        if not is_datetime64_any_dtype(values):
+            try:
+                values = pd.to_datetime(values, errors="coerce", cache=True)
+            except (TypeError, ValueError):
+                continue
+            if not is_datetime64_any_dtype(values):
+                # Mixed time zone offsets parse to objects; leave the column out
+                continue
+        if values.dt.tz is not None:
+            values = values.dt.tz_localize(None)
+
+        parsed[col] = values.to_numpy()
+
+    return parsed
+
+
+@functools.lru_cache(maxsize=64)
+def parse_date_bound(value):
+    """
+    Parse a date filter bound entered in the dashboard.
+
+    Results are cached, so re-applying the same filter does not parse the
+    text again.
+
+    Parameters
+    ----------
+    value : str
+        Date text such as ``"2024-01-31"``.
+
+    Returns
+    -------
+    numpy.datetime64 or None
+        Parsed bound, or None if the text is empty or not a valid date.
+    """
+    text = value.strip()
+    if not text:
+        return None
+
+    try:
+        parsed = pd.to_datetime(text)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+    if pd.isna(parsed):
+        return None
+    if parsed.tz is not None:
+        parsed = parsed.tz_localize(None)
+    return parsed.to_datetime64()
+
+
+def categorical_mask(series, selected_values):
+    """
+    Build a boolean mask of rows whose value is among the selected strings.
+
+    Category columns are matched through a lookup table indexed by their
+    integer codes and pure string columns are matched directly, so the
+    column is only cast to ``str`` when it holds mixed value types.
+
+    Parameters
+    ----------
+    series : Series
+        Categorical or object column to match.
+    selected_values : list of str
+        Values selected in the dashboard dropdown.
+
+    Returns
+    -------
+    ndarray
+        Boolean mask aligned with ``series``.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Lookup table indexed by code; the extra trailing slot catches -1 (missing)
+        categories = series.cat.categories.astype(str)
+        keep = np.zeros(len(categories) + 1, dtype=bool)
+        keep[:-1] = categories.isin(selected_values)
+        return keep[series.cat.codes.to_numpy()]
+
+    if infer_dtype(series, skipna=True) == "string":
+        return series.isin(selected_values).to_numpy()
+
+    return series.astype(str).isin(selected_values).to_numpy()
+
+
+def dataframe_payload(df):
+    """
+    Convert a DataFrame into the table payload accepted by ``gr.DataFrame``.
+
+    Returning the payload directly lets a cached preview be reused across
+    callbacks without converting the DataFrame again on every render.
+
+    Parameters
+    ----------
+    df : DataFrame
+        Rows to display.
+
+    Returns
+    -------
+    dict or None
+        Dictionary with ``headers`` and ``data`` keys, or None if ``df`` is None.
+    """
+    if df is None:
+        return None
+
+    return {
+        "headers": list(df.columns),
+        "data": df.to_dict(orient="split")["data"],
+    }
 
 
 def apply_filters(df, num_filters, cat_filters, date_filters):
@@ -65,42 +288,44 @@ def apply_filters(df, num_filters, cat_filters, date_filters):
     if df is None or df.empty:
         return pd.DataFrame()
 
-    filtered_df = df.copy()
+    # Combine every condition into one mask and slice the dataset once
+    mask = np.ones(len(df), dtype=bool)
 
     # Numeric filters
     for col, bounds in num_filters.items():
-        if col in filtered_df.columns:
+        if col in df.columns:
             min_val, max_val = bounds
+            values = df[col].to_numpy()
             if min_val is not None:
-                filtered_df = filtered_df[filtered_df[col] >= min_val]
+                mask &= values >= min_val
             if max_val is not None:
-                filtered_df = filtered_df[filtered_df[col] <= max_val]
+                mask &= values <= max_val
 
     # Categorical filters
     for col, selected_values in cat_filters.items():
-        if col in filtered_df.columns and selected_values:
-            filtered_df = filtered_df[filtered_df[col].isin(selected_values)]
+        if col in df.columns and selected_values:
+            mask &= df[col].isin(selected_values).to_numpy()
 
     # Date filters
     for col, drange in date_filters.items():
-        if col in filtered_df.columns:
+        if col in df.columns:
             start, end = drange
 
             if start:
                 try:
                     start_dt = pd.to_datetime(start)
-                    filtered_df = filtered_df[filtered_df[col] >= start_dt]
-                except Exception:
+                    mask &= (df[col] >= start_dt).to_numpy()
+                except (TypeError, ValueError):
                     pass
 
             if end:
                 try:
                     end_dt = pd.to_datetime(end)
-                    filtered_df = filtered_df[filtered_df[col] <= end_dt]
-                except Exception:
+                    mask &= (df[col] <= end_dt).to_numpy()
+                except (TypeError, ValueError):
                     pass
 
-    return filtered_df
+    return df.loc[mask]
 
 
 def validate_column_exists(df, column_name):
@@ -224,3 +449,99 @@ def get_date_range(df, date_column):
         return col.min(), col.max()
     except Exception:
         return None, None
+
+
+def save_data_as_csv(df, filename):
+    """
+    Save a DataFrame to a CSV file.
+
+    ``DataFrame.to_csv`` is used so the export keeps its established
+    format: timestamps without trailing nanoseconds, pandas float and
+    boolean spelling, and quotes only where a field needs them.
+
+    Parameters
+    ----------
+    df : DataFrame
+        Dataset to save.
+    filename : str
+        Destination file path.
+
+    Returns
+    -------
+    str or None
+        File path if successful, otherwise None.
+    """
+    if df is None:
+        return None
+
+    df.to_csv(filename, index=False)
+    return filename
+
+
+def _stringify_mixed_columns(df):
+    """
+    Convert object and category columns holding mixed value types to strings.
+
+    Arrow needs a single type per column, so values such as a mix of
+    text and integers are written as their string form. Missing values
+    are left missing.
+
+    Parameters
+    ----------
+    df : DataFrame
+
+    Returns
+    -------
+    DataFrame
+        Dataset with Arrow-compatible object columns.
+    """
+    converted = {}
+    for col, dtype in df.dtypes.items():
+        # Category columns are checked through their categories
+        values = dtype.categories if isinstance(dtype, pd.CategoricalDtype) else df[col]
+        if values.dtype == object and infer_dtype(values, skipna=True) not in (
+            "string", "bytes", "empty"
+        ):
+            values = df[col].astype(object)
+            converted[col] = values.where(values.isna(), values.astype(str))
+
+    if not converted:
+        return df
+
+    df = df.copy(deep=False)
+    for col, values in converted.items():
+        df[col] = values
+    return df
+
+
+def save_data_as_parquet(df, filename, compression="zstd"):
+    """
+    Save a DataFrame to a compressed Parquet file.
+
+    Object or category columns that mix value types, as Excel uploads and
+    unparsed text columns can, are written as strings.
+
+    Parameters
+    ----------
+    df : DataFrame
+        Dataset to save.
+    filename : str
+        Destination file path.
+    compression : str, optional
+        Parquet compression codec.
+
+    Returns
+    -------
+    str or None
+        File path if successful, otherwise None.
+    """
+    if df is None:
+        return None
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except pa.ArrowException:
+        # Mixed-type object columns cannot be typed by Arrow
+        table = pa.Table.from_pandas(_stringify_mixed_columns(df), preserve_index=False)
+    pq.write_table(table, filename, compression=compression)
+    return filename
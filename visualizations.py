@@ -4,11 +4,15 @@ Provides chart generation utilities using matplotlib and seaborn.
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib import cbook
+from pandas.api.types import is_datetime64_any_dtype
 
+from data_processor import correlation_matrix
 
-def create_time_series_plot(df, date_col, value_col, agg="sum"):
+
+def create_time_series_plot(df, date_col, value_col, agg="sum", dates=None, max_points=2000):
     """
     Create a time series line chart with an aggregation function.
 
@@ -22,6 +26,12 @@ def create_time_series_plot(df, date_col, value_col, agg="sum"):
         Column containing numeric values to aggregate.
     agg : str, optional
         Aggregation method: 'sum', 'mean', 'count', or 'median'.
+    dates : ndarray, optional
+        Pre-parsed datetime64 values of ``date_col``. If omitted, the column
+        is parsed on each call.
+    max_points : int, optional
+        Longer aggregated series are reduced to about this many points,
+        keeping the first, last, minimum, and maximum value of each bucket.
 
     Returns
     -------
@@ -31,32 +41,138 @@ def create_time_series_plot(df, date_col, value_col, agg="sum"):
     if df is None or not date_col or not value_col:
         return None
 
-    temp = df.copy()
-    temp["_date"] = pd.to_datetime(
-        temp[date_col], dayfirst=True, errors="coerce"
-    ).dt.to_period("D").astype(str)
-
-    if agg == "sum":
-        grouped = temp.groupby("_date")[value_col].sum()
-    elif agg == "mean":
-        grouped = temp.groupby("_date")[value_col].mean()
-    elif agg == "count":
-        grouped = temp.groupby("_date")[value_col].count()
-    else:
-        grouped = temp.groupby("_date")[value_col].median()
-
-    fig, ax = plt.subplots(figsize=(10, 5))
+    if dates is None:
+        parsed = pd.to_datetime(df[date_col], dayfirst=True, errors="coerce")
+        if not is_datetime64_any_dtype(parsed):
+            # Mixed time zone offsets cannot be placed on one axis
+            return None
+        if parsed.dt.tz is not None:
+            parsed = parsed.dt.tz_localize(None)
+        dates = parsed.to_numpy()
+
+    if agg not in ("sum", "mean", "count"):
+        agg = "median"
+
+    # Group on day-truncated datetime64 keys; NaT rows are dropped
+    days = np.asarray(dates).astype("datetime64[D]")
+    grouped = None
+    if agg != "median":
+        grouped = _daily_bincount(days, df[value_col], agg)
+    if grouped is None:
+        grouped = df[value_col].groupby(days).agg(agg)
+    if max_points and len(grouped) > max_points:
+        grouped = grouped.iloc[_m4_indices(grouped.to_numpy(dtype=np.float64), max_points)]
+
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
     grouped.plot(ax=ax, linewidth=2)
     ax.set_title(f"{value_col} ({agg}) Over Time", fontsize=14)
     ax.set_xlabel("Date", fontsize=12)
     ax.set_ylabel(f"{value_col} ({agg})", fontsize=12)
     ax.grid(True, alpha=0.3)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    ax.tick_params(axis="x", labelrotation=45)
+    fig.tight_layout()
 
     return fig
 
 
+def _daily_bincount(days, values, agg):
+    """
+    Sum, average, or count values per day with ``np.bincount``.
+
+    Days are offset from the earliest one and used directly as bin
+    numbers, which avoids hashing the keys in a groupby. Missing values
+    are skipped and days without any rows are left out, as with
+    ``groupby(days).agg(agg)``.
+
+    Parameters
+    ----------
+    days : ndarray
+        datetime64[D] keys aligned with ``values``; NaT rows are ignored.
+    values : Series
+        Numeric values to aggregate.
+    agg : str
+        One of 'sum', 'mean', or 'count'.
+
+    Returns
+    -------
+    Series or None
+        Aggregated values indexed by day, or None if the values are not
+        numeric or the days are too sparse for dense bins.
+    """
+    try:
+        vals = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    except (TypeError, ValueError):
+        return None
+
+    keep = ~np.isnat(days)
+    if not keep.any():
+        return None
+    day_numbers = days[keep].view(np.int64)
+    vals = vals[keep]
+
+    first = day_numbers.min()
+    bins = day_numbers - first
+    if bins.max() > 10 * len(bins) + 1000:
+        return None
+
+    present = np.flatnonzero(np.bincount(bins))
+    valid = ~np.isnan(vals)
+    counts = np.bincount(bins, weights=valid)[present]
+    if agg == "count":
+        result = counts.astype(np.int64)
+    else:
+        totals = np.bincount(bins, weights=np.where(valid, vals, 0.0))[present]
+        if agg == "sum":
+            result = totals
+        else:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result = totals / counts
+
+    index = pd.DatetimeIndex((present + first).astype("datetime64[D]"))
+    return pd.Series(result, index=index, name=values.name)
+
+
+def _m4_indices(values, max_points):
+    """
+    Select the positions that preserve the shape of a long line series.
+
+    The series is split into ``max_points // 4`` equal buckets and the
+    first, last, minimum, and maximum point of each bucket is kept (M4
+    downsampling), so peaks and troughs survive at the plotted resolution.
+
+    Parameters
+    ----------
+    values : ndarray
+        Float values of the series, possibly containing NaN.
+    max_points : int
+        Upper bound on the number of selected positions.
+
+    Returns
+    -------
+    ndarray
+        Sorted, unique positions into ``values``.
+    """
+    n = len(values)
+    n_buckets = max(1, max_points // 4)
+    size = -(-n // n_buckets)                     # ceiling division
+    n_buckets = -(-n // size)
+
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = values
+    buckets = padded.reshape(n_buckets, size)
+    missing = np.isnan(buckets)
+
+    starts = np.arange(n_buckets) * size
+    positions = np.concatenate([
+        starts,
+        np.minimum(starts + size - 1, n - 1),
+        starts + np.where(missing, np.inf, buckets).argmin(axis=1),
+        starts + np.where(missing, -np.inf, buckets).argmax(axis=1),
+    ])
+    return np.unique(positions[positions < n])
+
+
 def create_distribution_plot(df, col, chart_type="histogram"):
     """
     Create a distribution plot for a numeric column.
@@ -78,20 +194,29 @@ def create_distribution_plot(df, col, chart_type="histogram"):
     if df is None or not col:
         return None
 
-    fig, ax = plt.subplots(figsize=(10, 5))
+    # Bin or summarize in NumPy and hand matplotlib only the small result
+    values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    values = values[np.isfinite(values)]
+
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
 
     if chart_type == "histogram":
-        df[col].hist(ax=ax, bins=50, edgecolor="black", color="steelblue")
+        counts, edges = np.histogram(values, bins=50)
+        ax.bar(
+            edges[:-1], counts, width=np.diff(edges), align="edge",
+            edgecolor="black", color="steelblue",
+        )
         ax.set_xlabel(col, fontsize=12)
         ax.set_ylabel("Frequency", fontsize=12)
         ax.set_title(f"Distribution of {col}", fontsize=14)
     else:
-        df.boxplot(column=col, ax=ax, patch_artist=True)
+        ax.bxp(cbook.boxplot_stats(values, labels=[col]), patch_artist=True)
         ax.set_title(f"Box Plot of {col}", fontsize=14)
         ax.set_ylabel(col, fontsize=12)
 
     ax.grid(True, alpha=0.3)
-    plt.tight_layout()
+    fig.tight_layout()
 
     return fig
 
@@ -121,18 +246,15 @@ def create_category_bar_chart(df, cat_col, value_col, agg="sum", top_n=20):
     if df is None or not cat_col or not value_col:
         return None
 
-    if agg == "sum":
-        grouped = df.groupby(cat_col)[value_col].sum()
-    elif agg == "mean":
-        grouped = df.groupby(cat_col)[value_col].mean()
-    elif agg == "count":
-        grouped = df.groupby(cat_col)[value_col].count()
-    else:
-        grouped = df.groupby(cat_col)[value_col].median()
+    if agg not in ("sum", "mean", "count"):
+        agg = "median"
 
-    grouped = grouped.sort_values(ascending=False).head(top_n)
+    # Skip group sorting and unobserved categories; only the top N are plotted
+    grouped = df.groupby(cat_col, sort=False, observed=True)[value_col].agg(agg)
+    grouped = grouped.nlargest(top_n)
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
     grouped.plot(kind="bar", ax=ax, edgecolor="black", color="coral")
     ax.set_title(
         f"{value_col} ({agg}) by {cat_col} (Top {top_n})",
@@ -141,8 +263,10 @@ def create_category_bar_chart(df, cat_col, value_col, agg="sum", top_n=20):
     ax.set_xlabel(cat_col, fontsize=12)
     ax.set_ylabel(f"{value_col} ({agg})", fontsize=12)
     ax.grid(True, alpha=0.3, axis="y")
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
+    ax.tick_params(axis="x", labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment("right")
+    fig.tight_layout()
 
     return fig
 
@@ -170,29 +294,56 @@ def create_scatter_plot(df, x_col, y_col, sample_size=5000):
     if df is None or not x_col or not y_col:
         return None
 
-    sample = df if len(df) < sample_size else df.sample(sample_size)
+    # Sample only the plotted columns, with a fixed seed for repeatable renders
+    names = list(dict.fromkeys([x_col, y_col]))
+    columns = df.columns.get_indexer(names)
+    if (columns < 0).any():
+        raise KeyError([name for name, i in zip(names, columns) if i < 0])
+
+    if len(df) > sample_size:
+        # Generator.choice draws the positions in O(sample_size) without
+        # permuting the whole index
+        rng = np.random.default_rng(0)
+        rows = np.sort(rng.choice(len(df), size=sample_size, replace=False))
+        sample = df.iloc[rows, columns]
+    else:
+        sample = df.iloc[:, columns]
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.scatter(sample[x_col], sample[y_col], alpha=0.5, s=20, color="teal")
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.scatter(
+        sample[x_col].to_numpy(), sample[y_col].to_numpy(),
+        alpha=0.5, s=20, color="teal",
+    )
     ax.set_title(f"{y_col} vs {x_col}", fontsize=14)
     ax.set_xlabel(x_col, fontsize=12)
     ax.set_ylabel(y_col, fontsize=12)
     ax.grid(True, alpha=0.3)
-    plt.tight_layout()
+    fig.tight_layout()
 
     return fig
 
 
-def create_correlation_heatmap(df, figsize=(10, 8)):
+def create_correlation_heatmap(df, figsize=(10, 8), corr=None, max_columns=20, annot_max=15):
     """
     Create a heatmap showing correlation values between numeric columns.
 
+    Wide matrices are reduced to the columns with the strongest overall
+    correlations, and cell annotations are only drawn for small matrices,
+    since text rendering dominates the plotting time.
+
     Parameters
     ----------
     df : DataFrame
         Dataset from which to compute correlations.
     figsize : tuple, optional
         Size of the output figure.
+    corr : DataFrame, optional
+        Precomputed correlation matrix to plot instead of computing one.
+    max_columns : int, optional
+        Maximum number of columns shown.
+    annot_max : int, optional
+        Largest number of columns for which values are annotated.
 
     Returns
     -------
@@ -202,16 +353,26 @@ def create_correlation_heatmap(df, figsize=(10, 8)):
     if df is None:
         return None
 
-    numeric_df = df.select_dtypes(include=["number"])
-    if numeric_df.empty:
+    if corr is None:
+        # Same BLAS-based computation as the Statistics tab
+        corr = correlation_matrix(df)
+    if corr.empty:
         return None
 
-    corr = numeric_df.corr()
+    if len(corr) > max_columns:
+        # Rank columns by their total absolute correlation with the others
+        strength = corr.abs().sum() - 1
+        keep = strength.nlargest(max_columns).index
+        corr = corr.loc[keep, keep]
+
+    # Imported on first use; seaborn adds noticeably to dashboard start-up
+    import seaborn as sns
 
-    fig, ax = plt.subplots(figsize=figsize)
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
     sns.heatmap(
         corr,
-        annot=True,
+        annot=len(corr) <= annot_max,
         cmap="coolwarm",
         center=0,
         ax=ax,
@@ -220,7 +381,7 @@ def create_correlation_heatmap(df, figsize=(10, 8)):
         linewidths=0.5
     )
     ax.set_title("Correlation Heatmap", fontsize=14)
-    plt.tight_layout()
+    fig.tight_layout()
 
     return fig
 
@@ -244,6 +405,7 @@ def save_plot_as_png(fig, filename):
     if fig is None:
         return None
 
-    fig.savefig(filename, dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    # The chart functions already apply tight_layout, so the figure is saved
+    # as is; bbox_inches="tight" would render it an extra time to measure it
+    fig.savefig(filename, dpi=150)
     return filename